@@ -1,24 +1,29 @@
 import asyncio
 import enum
+import functools
 import logging
 import string
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Self
+from typing import TYPE_CHECKING, Any, Self
 
 import aiomqtt
 import httpx
 import jinja2
-from croniter import croniter
 from private_assistant_commons import BaseSkill, messages
-from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel import col, delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from private_assistant_alarm_scheduler_skill import config, models, tools_time_units
 
+if TYPE_CHECKING:
+    from croniter import croniter
 
-class Parameters(BaseModel):
+
+@dataclass(slots=True)
+class Parameters:
     alarm_time: datetime | None = None
     alarm_name: str = "Default Cron Alarm"
 
@@ -36,13 +41,55 @@ class Action(enum.Enum):
 
     @classmethod
     def find_matching_action(cls, text: str) -> Self | None:
-        text = text.translate(str.maketrans("", "", string.punctuation))
-        text_words = set(text.lower().split())
+        return _match_action(text)  # type: ignore[return-value]
+
+
+# Built once at import time so find_matching_action does not rebuild the
+# translation table and keyword sets on every request
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+_ACTION_KEYWORDS = tuple((action, frozenset(action.value)) for action in Action)
+
+# Maps spoken time units to a setter applying the value to the alarm time; a
+# dispatch table keeps the datetime.replace calls typed, unlike unpacking a
+# str-keyed dict into keyword arguments
+_UNIT_SETTERS: dict[str, Callable[[datetime, int], datetime]] = {
+    "o'clock": lambda alarm_time, value: alarm_time.replace(hour=value),
+    "hours": lambda alarm_time, value: alarm_time.replace(hour=value),
+    "minutes": lambda alarm_time, value: alarm_time.replace(minute=value),
+    "seconds": lambda alarm_time, value: alarm_time.replace(second=value),
+}
+
+
+# Two parameter sets that differ in every field; a template rendering identically
+# for both cannot depend on parameters and is safe to pre-render
+_STATIC_PROBE_PARAMETERS = (
+    Parameters(),
+    Parameters(alarm_time=datetime(2000, 1, 2, 3, 4, 5), alarm_name="probe"),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parsed_croniter(cron_expression: str) -> "croniter":
+    """Returns the parsed croniter for an expression, shared across skill instances.
+
+    The caller repositions it with set_current before use, so a single instance
+    per expression suffices in this single-threaded event loop.
+    """
+    # Imported lazily so processes that never reach a cron calculation skip the import
+    from croniter import croniter
 
-        for action in cls:
-            if all(word in text_words for word in action.value):
-                return action
-        return None
+    return croniter(cron_expression)
+
+
+@functools.lru_cache(maxsize=256)
+def _match_action(text: str) -> Action | None:
+    """Resolves the action matching a request text, memoized per utterance."""
+    text_words = set(text.translate(_PUNCTUATION_TABLE).lower().split())
+
+    for action, keywords in _ACTION_KEYWORDS:
+        if keywords <= text_words:
+            return action
+    return None
 
 
 class AlarmSchedulerSkill(BaseSkill):
@@ -58,31 +105,60 @@ class AlarmSchedulerSkill(BaseSkill):
         super().__init__(config_obj, mqtt_client, task_group, logger=logger)
         self.config_obj: config.SkillConfig = config_obj
         self.db_engine: AsyncEngine = db_engine
+        self._session_maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
         self.template_env = template_env
-        self._active_alarm_task: asyncio.Task | None = None
+        self._http_client = httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_keepalive_connections=2))
+        self._active_alarm_handle: asyncio.TimerHandle | None = None
+        self._active_alarm_id: int | None = None
+        self._precomputed_next_execution: datetime | None = None
+        self._precomputed_for_tick: datetime | None = None
+        self._precomputed_expression: str | None = None
         self.action_to_template: dict[Action, jinja2.Template] = {}
+        self._static_answers: dict[Action, str] = {}
+        # Dispatch table for process_request; actions without side effects are omitted
+        self._action_handlers: dict[Action, Callable[[Parameters], Any]] = {
+            Action.SET: self.register_alarm,
+            Action.SKIP: lambda _: self.add_task(self.skip_alarm()),
+            Action.BREAK: lambda _: self.add_task(self.break_execution()),
+            Action.CONTINUE: lambda _: self.add_task(self.set_next_alarm_from_cron()),
+        }
 
     def _load_templates(self) -> None:
         try:
             for action in Action:
-                self.action_to_template[action] = self.template_env.get_template(f"{action.name.lower()}.j2")
+                template = self.template_env.get_template(f"{action.name.lower()}.j2")
+                self.action_to_template[action] = template
+
+                # Templates whose output does not depend on parameters are rendered once
+                # up front so get_answer can return the cached string directly
+                rendered = template.render(action=action, parameters=_STATIC_PROBE_PARAMETERS[0])
+                if rendered == template.render(action=action, parameters=_STATIC_PROBE_PARAMETERS[1]):
+                    self._static_answers[action] = rendered
             self.logger.debug("Templates loaded successfully")
         except jinja2.TemplateNotFound as e:
             self.logger.error("Failed to load template: %s", e)
 
     async def _refresh_alarm(self) -> None:
-        async with AsyncSession(self.db_engine) as session:
-            statement = select(models.ASSActiveAlarm).where(models.ASSActiveAlarm.scheduled_time > datetime.now())
+        now = datetime.now()
+        async with self._session_maker() as session:
+            statement = select(models.ASSActiveAlarm).order_by(col(models.ASSActiveAlarm.scheduled_time)).limit(1)
             query_result = await session.exec(statement)
             active_alarm = query_result.first()
             if active_alarm:
-                self.logger.info("Active alarm found from previous session, starting alarm task.")
-                self.set_next_alarm(active_alarm.scheduled_time)
+                # Track the persisted row so register_alarm can replace it without a lookup
+                self._active_alarm_id = active_alarm.id
+                if active_alarm.scheduled_time > now:
+                    self.logger.info("Active alarm found from previous session, starting alarm task.")
+                    self.set_next_alarm(active_alarm.scheduled_time)
 
     async def skill_preparations(self) -> None:
         self._load_templates()
         await self._refresh_alarm()
 
+    async def aclose(self) -> None:
+        """Releases resources held by the skill, such as the shared HTTP client."""
+        await self._http_client.aclose()
+
     async def calculate_certainty(self, intent_analysis_result: messages.IntentAnalysisResult) -> float:
         """Calculate how confident the skill is about handling the given request."""
         if "alarm" in intent_analysis_result.nouns:
@@ -93,25 +169,28 @@ class AlarmSchedulerSkill(BaseSkill):
         self, action: Action, intent_analysis_result: messages.IntentAnalysisResult
     ) -> Parameters:
         parameters = Parameters()
+        now = datetime.now()
 
         # Set an alarm
         if action == Action.SET:
             parameters.alarm_name = "User Alarm"
-            parameters.alarm_time = datetime.now().replace(hour=6, minute=0, second=0, microsecond=0)
+            parameters.alarm_time = now.replace(hour=6, minute=0, second=0, microsecond=0)
             for result in intent_analysis_result.numbers:
-                if result.next_token == "o'clock" or result.next_token == "hours":
-                    parameters.alarm_time = parameters.alarm_time.replace(hour=result.number_token)
-                elif result.next_token == "minutes":
-                    parameters.alarm_time = parameters.alarm_time.replace(minute=result.number_token)
-                elif result.next_token == "seconds":
-                    parameters.alarm_time = parameters.alarm_time.replace(second=result.number_token)
-            if parameters.alarm_time < datetime.now():
+                setter = _UNIT_SETTERS.get(result.next_token) if result.next_token else None
+                if setter:
+                    parameters.alarm_time = setter(parameters.alarm_time, result.number_token)
+            if parameters.alarm_time < now:
                 parameters.alarm_time += timedelta(days=1)
 
         elif action == Action.GET_ACTIVE:
             # Retrieve the currently active alarm from the database
-            async with AsyncSession(self.db_engine) as session:
-                statement = select(models.ASSActiveAlarm).where(models.ASSActiveAlarm.scheduled_time > datetime.now())
+            async with self._session_maker() as session:
+                statement = (
+                    select(models.ASSActiveAlarm)
+                    .where(models.ASSActiveAlarm.scheduled_time > now)
+                    .order_by(col(models.ASSActiveAlarm.scheduled_time))
+                    .limit(1)
+                )
                 query_result = await session.exec(statement)
                 active_alarm = query_result.first()
                 if active_alarm:
@@ -127,18 +206,21 @@ class AlarmSchedulerSkill(BaseSkill):
 
         return parameters
 
-    def calculate_next_cron_execution(self, skip_next: bool = False) -> datetime:
+    def calculate_next_cron_execution(self, skip_next: bool = False, start_time: datetime | None = None) -> datetime:
         """Calculates the next cron-based execution time.
 
         Args:
             skip_next (bool): If True, skip the next cron occurrence and return the one after that.
+            start_time (datetime | None): Base time for the calculation; defaults to now.
 
         Returns:
             datetime: The calculated next execution time.
         """
-        cron_expression = self.config_obj.cron_expression
-        now = datetime.now()
-        cron_iter = croniter(cron_expression, now)
+        now = start_time if start_time is not None else datetime.now()
+
+        # The parsed expression is cached process-wide; only reposition it here
+        cron_iter = _parsed_croniter(self.config_obj.cron_expression)
+        cron_iter.set_current(now, force=True)
 
         # Skip the next occurrence if needed
         if skip_next:
@@ -147,13 +229,19 @@ class AlarmSchedulerSkill(BaseSkill):
         return cron_iter.get_next(datetime)  # type: ignore
 
     async def register_alarm(self, parameters: Parameters) -> None:
-        async with AsyncSession(self.db_engine) as session:
-            # Remove any existing alarm as we only support one active alarm at a time
-            statement = select(models.ASSActiveAlarm)
-            query_result = await session.exec(statement)
-            existing_alarm = query_result.first()
-            if existing_alarm:
-                await session.delete(existing_alarm)
+        # Arming anything other than the precomputed cron tick invalidates the
+        # cached follow-up: the next firing is no longer the one it was computed for
+        if parameters.alarm_time != self._precomputed_for_tick:
+            self._precomputed_next_execution = None
+            self._precomputed_for_tick = None
+
+        async with self._session_maker() as session:
+            # Only one active alarm is supported; replace the tracked row if there is
+            # one and skip the DELETE entirely when the slot is known to be empty
+            if self._active_alarm_id is not None:
+                await session.exec(
+                    delete(models.ASSActiveAlarm).where(col(models.ASSActiveAlarm.id) == self._active_alarm_id)
+                )
 
             # Register new alarm
             active_alarm = models.ASSActiveAlarm(
@@ -163,34 +251,38 @@ class AlarmSchedulerSkill(BaseSkill):
             session.add(active_alarm)
             scheduled_time = active_alarm.scheduled_time
             await session.commit()
+            self._active_alarm_id = active_alarm.id
             self.logger.debug("Alarm set for %s.", scheduled_time)
 
         self.set_next_alarm(scheduled_time)
 
     def set_next_alarm(self, scheduled_time: datetime) -> None:
-        time_until_alarm = (scheduled_time - datetime.now()).total_seconds()
+        # Clamp past schedules (clock skew, suspend/resume) so the timer fires
+        # once immediately instead of with a negative delay
+        time_until_alarm = max((scheduled_time - datetime.now()).total_seconds(), 0.0)
 
-        # Cancel any existing timer task
-        if self._active_alarm_task:
-            self._active_alarm_task.cancel()
-            self.logger.debug("Existing alarm timer task canceled.")
+        # Cancel any existing timer
+        if self._active_alarm_handle:
+            self._active_alarm_handle.cancel()
+            self.logger.debug("Existing alarm timer canceled.")
 
-        # Create a new task to trigger the alarm after the given delay
-        self._active_alarm_task = self.add_task(self.trigger_alarm_after_delay(time_until_alarm))
+        # Register the alarm directly on the event loop's timer heap instead of
+        # keeping a coroutine alive in asyncio.sleep for hours
+        loop = asyncio.get_running_loop()
+        self._active_alarm_handle = loop.call_at(loop.time() + time_until_alarm, self._fire_alarm)
 
-    async def trigger_alarm_after_delay(self, delay: float) -> None:
-        await asyncio.sleep(delay)
-        await self.trigger_alarm()
+    def _fire_alarm(self) -> None:
+        self._active_alarm_handle = None
+        self.add_task(self.trigger_alarm())
 
     async def trigger_alarm(self) -> None:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.config_obj.webhook_url,
-                    json={"message": "Alarm triggered", "alarm_time": datetime.now().isoformat()},
-                )
-                response.raise_for_status()
-                self.logger.info("Alarm triggered successfully.")
+            response = await self._http_client.post(
+                self.config_obj.webhook_url,
+                json={"message": "Alarm triggered", "alarm_time": datetime.now().isoformat()},
+            )
+            response.raise_for_status()
+            self.logger.info("Alarm triggered successfully.")
         except httpx.HTTPStatusError as exc:
             self.logger.error("Failed to trigger alarm: %s %s", exc.response.status_code, exc.response.text)
         except Exception as e:
@@ -201,24 +293,51 @@ class AlarmSchedulerSkill(BaseSkill):
 
     async def set_next_alarm_from_cron(self) -> None:
         """Sets the next alarm based on the cron schedule."""
-        # Calculate the next cron-based execution time
-        next_execution = self.calculate_next_cron_execution(skip_next=False)
+        now = datetime.now()
+        cron_expression = self.config_obj.cron_expression
+
+        # The follow-up tick was precomputed when the previous cron alarm was
+        # armed, and it is only valid right after that alarm fired. Consume it
+        # once (clear on read) and only when the seeding tick already lies in
+        # the past: a CONTINUE issued before the armed tick fires must re-arm
+        # that same tick, not silently skip ahead to the one after it
+        cached = self._precomputed_next_execution
+        seeding_tick = self._precomputed_for_tick
+        self._precomputed_next_execution = None
+        self._precomputed_for_tick = None
+        if (
+            self._precomputed_expression == cron_expression
+            and cached is not None
+            and seeding_tick is not None
+            and seeding_tick <= now < cached
+        ):
+            next_execution = cached
+        else:
+            next_execution = self.calculate_next_cron_execution(skip_next=False)
+            if next_execution <= now:
+                # Cron returned a tick on the boundary we just fired; advance once
+                # so the alarm cannot re-trigger in a tight loop
+                next_execution = self.calculate_next_cron_execution(skip_next=True)
+
+        # Stash the tick after this one; it becomes usable once next_execution fires
+        self._precomputed_next_execution = self.calculate_next_cron_execution(start_time=next_execution)
+        self._precomputed_for_tick = next_execution
+        self._precomputed_expression = cron_expression
+
         parameters = Parameters(alarm_time=next_execution)
         await self.register_alarm(parameters)
         self.logger.info("Setting next cron iteration as alarm %s.", next_execution)
 
     async def break_execution(self) -> None:
-        async with AsyncSession(self.db_engine) as session:
-            statement = select(models.ASSActiveAlarm)
-            query_result = await session.exec(statement)
-            active_alarms = query_result.all()
-            for alarm in active_alarms:
-                await session.delete(alarm)
+        async with self._session_maker() as session:
+            # One bulk DELETE instead of fetching rows and deleting them one by one
+            await session.exec(delete(models.ASSActiveAlarm))
             await session.commit()
+            self._active_alarm_id = None
 
-        if self._active_alarm_task:
-            self._active_alarm_task.cancel()
-            self._active_alarm_task = None
+        if self._active_alarm_handle:
+            self._active_alarm_handle.cancel()
+            self._active_alarm_handle = None
             self.logger.info("All alarms and timers have been stopped.")
 
     async def skip_alarm(self) -> None:
@@ -230,6 +349,10 @@ class AlarmSchedulerSkill(BaseSkill):
         self.logger.info("Skipped the next cron iteration and set the alarm for %s.", second_next_execution)
 
     def get_answer(self, action: Action, parameters: Parameters) -> str:
+        static_answer = self._static_answers.get(action)
+        if static_answer is not None:
+            self.logger.debug("Returning pre-rendered answer for action %s.", action)
+            return static_answer
         template = self.action_to_template.get(action)
         if template:
             answer = template.render(
@@ -249,21 +372,11 @@ class AlarmSchedulerSkill(BaseSkill):
 
         parameters = await self.find_parameters(action, intent_analysis_result=intent_analysis_result)
 
-        if action == Action.SET:
-            await self.register_alarm(parameters)
-        elif action == Action.HELP:
-            pass
-        elif action == Action.SKIP:
-            self.add_task(self.skip_alarm())
-        elif action == Action.BREAK:
-            self.add_task(self.break_execution())
-        elif action == Action.CONTINUE:
-            self.add_task(self.set_next_alarm_from_cron())
-        elif action == Action.GET_ACTIVE:
-            pass
-        else:
-            self.logger.debug("No specific action implemented for action: %s", action)
-            return
+        handler = self._action_handlers.get(action)
+        if handler is not None:
+            result = handler(parameters)
+            if asyncio.iscoroutine(result):
+                await result
 
         answer = self.get_answer(action, parameters)
         self.add_task(self.send_response(answer, client_request=intent_analysis_result.client_request))
@@ -39,7 +39,11 @@ async def start_skill(
         loader=jinja2.PackageLoader(
             "private_assistant_alarm_scheduler_skill",
             "templates",
-        )
+        ),
+        # Templates never change at runtime; skip the per-lookup freshness check
+        # and keep every compiled template cached for the process lifetime
+        auto_reload=False,
+        cache_size=-1,
     )
 
     # Start the skill using the async MQTT connection handler
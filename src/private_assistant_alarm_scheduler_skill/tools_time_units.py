@@ -1,18 +1,26 @@
 from datetime import datetime
 
+# Precomputed English names so the date line avoids locale-aware strftime calls
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
 
-def format_time_for_tts(time: datetime, with_date: bool = False) -> str:
-    hour = time.hour
-    minute = time.minute
 
-    if minute == 0:
-        time_str = f"{hour} o'clock"
-    elif minute < 10:
-        time_str = f"{minute} past {hour}"
-    else:
-        time_str = f"{minute} past {hour}"
+def format_time_for_tts(time: datetime, with_date: bool = False) -> str:
+    time_str = f"{time.hour} o'clock" if time.minute == 0 else f"{time.minute} past {time.hour}"
 
     if with_date:
-        date_str = time.strftime("%A, %B %d")
-        return f"{date_str} at {time_str}"
+        return f"{_WEEKDAYS[time.weekday()]}, {_MONTHS[time.month - 1]} {time.day:02d} at {time_str}"
     return time_str
@@ -0,0 +1,22 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine_async():
+    # One engine and one schema creation for the whole test session; tests clean
+    # up their own rows instead of recreating tables. StaticPool pins a single
+    # SQLite handle so every session sees the same in-memory database instead of
+    # each pooled connection getting its own
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
@@ -1,181 +1,225 @@
 import logging
-import unittest
+import uuid
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import jinja2
-import respx
-from httpx import Response
+import pytest
+import pytest_asyncio
+import time_machine
+from httpx import Request, Response
 from private_assistant_commons import messages
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import SQLModel, select
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from private_assistant_alarm_scheduler_skill import models
 from private_assistant_alarm_scheduler_skill.alarm_scheduler_skill import Action, AlarmSchedulerSkill, Parameters
 
-
-class TestAlarmSchedulerSkill(unittest.IsolatedAsyncioTestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Set up an in-memory SQLite database for async usage
-        cls.engine_async = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
-
-    async def asyncSetUp(self):
-        # Create tables asynchronously before each test
-        async with self.engine_async.begin() as conn:
-            await conn.run_sync(SQLModel.metadata.create_all)
-
-        # Create mock components for testing
-        self.mock_mqtt_client = AsyncMock()
-        self.mock_config = Mock()
-        self.mock_config.webhook_url = "https://example.org/api"
-        self.mock_config.cron_expression = "0 6 * * *"  # Daily at 6 AM for cron tests
-        self.mock_template_env = Mock(spec=jinja2.Environment)
-        self.mock_task_group = AsyncMock()
-        self.mock_logger = Mock(logging.Logger)
-
-        # Create an instance of AlarmSchedulerSkill using the in-memory DB and mocked dependencies
-        self.skill = AlarmSchedulerSkill(
-            config_obj=self.mock_config,
-            mqtt_client=self.mock_mqtt_client,
-            db_engine=self.engine_async,
-            template_env=self.mock_template_env,
-            task_group=self.mock_task_group,
-            logger=self.mock_logger,
-        )
-
-    async def asyncTearDown(self):
-        # Drop tables asynchronously after each test to ensure a clean state
-        async with self.engine_async.begin() as conn:
-            await conn.run_sync(SQLModel.metadata.drop_all)
-
-    async def test_find_parameters(self):
-        # Mock IntentAnalysisResult for different actions
-
-        # SET Action
-        mock_intent_result_set = Mock(spec=messages.IntentAnalysisResult)
-        mock_intent_result_set.nouns = ["alarm"]
-        mock_intent_result_set.numbers = [Mock(number_token=6, next_token="o'clock")]
-        mock_intent_result_set.client_request = Mock()
-
-        parameters_set = await self.skill.find_parameters(Action.SET, mock_intent_result_set)
-        self.assertIsInstance(parameters_set, Parameters)
-        self.assertIsNotNone(parameters_set.alarm_time)
-        self.assertEqual(parameters_set.alarm_time.hour, 6)
-
-        # GET_ACTIVE Action (No active alarm scenario)
-        mock_intent_result_get_active = Mock(spec=messages.IntentAnalysisResult)
-        mock_intent_result_get_active.client_request = Mock()
-
-        parameters_get_active = await self.skill.find_parameters(Action.GET_ACTIVE, mock_intent_result_get_active)
-        self.assertIsInstance(parameters_get_active, Parameters)
-        self.assertIsNone(parameters_get_active.alarm_time)
-
-        # CONTINUE Action (Should calculate next cron time)
-        mock_intent_result_continue = Mock(spec=messages.IntentAnalysisResult)
-        mock_intent_result_continue.client_request = Mock()
-
-        parameters_continue = await self.skill.find_parameters(Action.CONTINUE, mock_intent_result_continue)
-        self.assertIsInstance(parameters_continue, Parameters)
-        self.assertIsNotNone(parameters_continue.alarm_time)
-        self.assertGreater(parameters_continue.alarm_time, datetime.now())
-
-        # SKIP Action (Should calculate the second next cron time)
-        mock_intent_result_skip = Mock(spec=messages.IntentAnalysisResult)
-        mock_intent_result_skip.client_request = Mock()
-
-        parameters_skip = await self.skill.find_parameters(Action.SKIP, mock_intent_result_skip)
-        self.assertIsInstance(parameters_skip, Parameters)
-        self.assertIsNotNone(parameters_skip.alarm_time)
-        self.assertGreater(parameters_skip.alarm_time, datetime.now())
-
-    def test_calculate_next_cron_execution_no_skip(self):
-        # Test calculate_next_cron_execution without skipping
-        next_execution = self.skill.calculate_next_cron_execution(skip_next=False)
-        self.assertGreater(next_execution, datetime.now())
-        self.assertEqual(next_execution.hour, 6)
-
-    def test_calculate_next_cron_execution_skip(self):
-        # Test calculate_next_cron_execution with skipping the next occurrence
-        first_execution = self.skill.calculate_next_cron_execution(skip_next=False)
-        second_execution = self.skill.calculate_next_cron_execution(skip_next=True)
-        self.assertGreater(second_execution, first_execution)
-        self.assertEqual(second_execution.hour, 6)
-
-    async def test_set_next_alarm_from_cron(self):
-        # Mock register_alarm to verify it gets called with correct parameters
-        with patch.object(self.skill, "register_alarm") as mock_register_alarm:
-            await self.skill.set_next_alarm_from_cron()
-
-            # Verify that register_alarm was called with the correct parameters
-            mock_register_alarm.assert_called_once()
-            parameters = mock_register_alarm.call_args[0][0]
-            self.assertIsInstance(parameters.alarm_time, datetime)
-            self.assertGreater(parameters.alarm_time, datetime.now())
-            self.assertEqual(parameters.alarm_time.hour, 6)
-
-    async def test_skip_alarm(self):
-        # Mock register_alarm to verify it gets called with correct parameters after skipping
-        with patch.object(self.skill, "register_alarm") as mock_register_alarm:
-            await self.skill.skip_alarm()
-
-            # Verify that register_alarm was called with the correct parameters
-            mock_register_alarm.assert_called_once()
-            parameters = mock_register_alarm.call_args[0][0]
-            self.assertIsInstance(parameters.alarm_time, datetime)
-            self.assertGreater(parameters.alarm_time, datetime.now())
-            self.assertEqual(parameters.alarm_time.hour, 6)
-
-    async def test_trigger_alarm_success(self):
-        with respx.mock as respx_mock:
-            # Set up the mocked API route for success
-            respx_mock.post(self.mock_config.webhook_url).mock(return_value=Response(200, json={"message": "success"}))
-            with patch.object(self.skill, "set_next_alarm_from_cron") as mock_set_next_alarm_from_cron:
-                # Trigger alarm
-                await self.skill.trigger_alarm()
-
-                # Verify the call to set the next alarm
-                mock_set_next_alarm_from_cron.assert_called_once()
-
-    async def test_trigger_alarm_failure(self):
-        with respx.mock as respx_mock:
-            # Set up the mocked API route for failure
-            respx_mock.post(self.mock_config.webhook_url).mock(
-                return_value=Response(500, json={"error": "internal server error"})
-            )
-
-            with patch.object(self.skill, "set_next_alarm_from_cron") as mock_set_next_alarm_from_cron:
-                # Trigger alarm
-                await self.skill.trigger_alarm()
-
-                # Verify that an error log is generated
-                self.mock_logger.error.assert_called_once()
-                self.assertTrue("An error occurred while triggering alarm:" in self.mock_logger.error.call_args[0][0])
-
-                # Verify the retry logic
-                mock_set_next_alarm_from_cron.assert_called_once()
-
-    async def test_break_execution(self):
-        # Add a mock active alarm to the database
-        mock_alarm = models.ASSActiveAlarm(
-            name="Test Alarm",
-            scheduled_time=datetime.now() + timedelta(hours=1),
-        )
-        async with AsyncSession(self.engine_async) as session, session.begin():
-            session.add(mock_alarm)
-
-        # Set a mock active timer task
-        self.skill._active_alarm_task = AsyncMock()
-
-        # Execute break_execution
-        await self.skill.break_execution()
-
-        # Verify that the active timer task was cancelled
-        assert self.skill._active_alarm_task is None
-
-        # Verify that the alarm was deleted from the database
-        async with AsyncSession(self.engine_async) as session:
-            result = await session.exec(select(models.ASSActiveAlarm))
-            remaining_alarms = result.all()
-            self.assertEqual(len(remaining_alarms), 0)
+# Spec attribute lists computed once at import; handing Mock a list skips the
+# per-construction dir() scan and coroutine-function detection a class spec pays
+_JINJA_ENV_SPEC = dir(jinja2.Environment)
+_LOGGER_SPEC = dir(logging.Logger)
+
+
+def make_intent_analysis_result(
+    numbers: list[messages.NumberAnalysisResult] | None = None,
+) -> messages.IntentAnalysisResult:
+    # Real message objects are much cheaper to build than spec'd Mocks
+    return messages.IntentAnalysisResult(
+        client_request=messages.ClientRequest(
+            id=uuid.uuid4(),
+            text="alarm request",
+            room="livingroom",
+            output_topic="assistant/output",
+        ),
+        numbers=numbers or [],
+        nouns=["alarm"],
+        verbs=[],
+    )
+
+
+def make_webhook_response(status_code: int) -> Response:
+    # A Response with its request attached so raise_for_status works outside a transport
+    return Response(status_code, request=Request("POST", "https://example.org/api"))
+
+
+@pytest.fixture
+def mock_config():
+    # SimpleNamespace gives plain attribute access without Mock's auto-created
+    # child mocks on every lookup
+    return SimpleNamespace(
+        webhook_url="https://example.org/api",
+        cron_expression="0 6 * * *",  # Daily at 6 AM for cron tests
+    )
+
+
+@pytest_asyncio.fixture
+async def skill(engine_async, mock_config):
+    # Create an instance of AlarmSchedulerSkill using the shared in-memory DB
+    # and mocked dependencies
+    # Plain Mocks suffice here: the tests never await the MQTT client, and
+    # add_task only calls the synchronous task_group.create_task
+    skill = AlarmSchedulerSkill(
+        config_obj=mock_config,
+        mqtt_client=Mock(),
+        db_engine=engine_async,
+        template_env=Mock(spec=_JINJA_ENV_SPEC),
+        task_group=Mock(),
+        logger=Mock(spec=_LOGGER_SPEC),
+    )
+    yield skill
+    # Clear rows written by the test; far cheaper than dropping the schema. The
+    # tracked alarm id doubles as a dirty flag, so read-only tests skip the
+    # DELETE round-trip entirely (tests inserting rows directly must clean up
+    # themselves, as test_break_execution does via break_execution)
+    if skill._active_alarm_id is not None:
+        async with AsyncSession(engine_async) as session:
+            await session.execute(delete(models.ASSActiveAlarm))
+            await session.commit()
+
+
+@pytest.mark.parametrize(
+    "action, numbers, expects_alarm_time",
+    [
+        # SET uses the spoken numbers to build the alarm time
+        (Action.SET, [messages.NumberAnalysisResult(number_token=6, next_token="o'clock")], True),
+        # GET_ACTIVE without an active alarm in the database yields no time
+        (Action.GET_ACTIVE, [], False),
+        # CONTINUE calculates the next cron time
+        (Action.CONTINUE, [], True),
+        # SKIP calculates the second next cron time
+        (Action.SKIP, [], True),
+    ],
+)
+async def test_find_parameters(skill, action, numbers, expects_alarm_time):
+    intent_analysis_result = make_intent_analysis_result(numbers=numbers)
+
+    # CONTINUE/SKIP only need some future tick from the cron calculation, so it is
+    # stubbed out; the cron math itself is covered by the dedicated cron tests
+    next_tick = datetime(2099, 1, 1, 6, 0)
+    with patch.object(skill, "calculate_next_cron_execution", return_value=next_tick) as mock_calculate:
+        parameters = await skill.find_parameters(action, intent_analysis_result)
+
+    assert isinstance(parameters, Parameters)
+    if not expects_alarm_time:
+        assert parameters.alarm_time is None
+        return
+    assert parameters.alarm_time is not None
+    if action == Action.SET:
+        assert parameters.alarm_time.hour == 6
+    elif action == Action.CONTINUE:
+        mock_calculate.assert_called_once_with(skip_next=False)
+        assert parameters.alarm_time == next_tick
+    elif action == Action.SKIP:
+        mock_calculate.assert_called_once_with(skip_next=True)
+        assert parameters.alarm_time == next_tick
+
+
+@time_machine.travel("2024-01-01 00:00:00", tick=False)
+def test_calculate_next_cron_execution_no_skip(skill):
+    # Test calculate_next_cron_execution without skipping
+    next_execution = skill.calculate_next_cron_execution(skip_next=False)
+    assert next_execution == datetime(2024, 1, 1, 6, 0)
+
+
+@time_machine.travel("2024-01-01 00:00:00", tick=False)
+def test_calculate_next_cron_execution_skip(skill):
+    # Test calculate_next_cron_execution with skipping the next occurrence
+    first_execution = skill.calculate_next_cron_execution(skip_next=False)
+    second_execution = skill.calculate_next_cron_execution(skip_next=True)
+    assert first_execution == datetime(2024, 1, 1, 6, 0)
+    assert second_execution == datetime(2024, 1, 2, 6, 0)
+
+
+@time_machine.travel("2024-01-01 00:00:00", tick=False)
+async def test_set_next_alarm_from_cron(skill):
+    # Mock register_alarm to verify it gets called with correct parameters
+    with patch.object(skill, "register_alarm") as mock_register_alarm:
+        await skill.set_next_alarm_from_cron()
+
+        # Verify that register_alarm was called with the correct parameters
+        mock_register_alarm.assert_called_once()
+        parameters = mock_register_alarm.call_args[0][0]
+        assert parameters.alarm_time == datetime(2024, 1, 1, 6, 0)
+
+
+@time_machine.travel("2024-01-01 00:00:00", tick=False)
+async def test_set_next_alarm_from_cron_repeated(skill):
+    # Re-arming before the armed tick fires (e.g. CONTINUE twice in a row) must
+    # keep arming the same tick; consuming the precomputed follow-up tick here
+    # would silently turn the second CONTINUE into a SKIP
+    with patch.object(skill, "register_alarm") as mock_register_alarm:
+        await skill.set_next_alarm_from_cron()
+        await skill.set_next_alarm_from_cron()
+
+    first_call, second_call = mock_register_alarm.call_args_list
+    assert first_call[0][0].alarm_time == datetime(2024, 1, 1, 6, 0)
+    assert second_call[0][0].alarm_time == datetime(2024, 1, 1, 6, 0)
+
+
+@time_machine.travel("2024-01-01 00:00:00", tick=False)
+async def test_skip_alarm(skill):
+    # Mock register_alarm to verify it gets called with correct parameters after skipping
+    with patch.object(skill, "register_alarm") as mock_register_alarm:
+        await skill.skip_alarm()
+
+        # Verify that register_alarm was called with the correct parameters
+        mock_register_alarm.assert_called_once()
+        parameters = mock_register_alarm.call_args[0][0]
+        assert parameters.alarm_time == datetime(2024, 1, 2, 6, 0)
+
+
+async def test_trigger_alarm_success(skill):
+    # Patch the shared client directly; these tests never inspect the HTTP request
+    with (
+        patch.object(skill._http_client, "post", AsyncMock(return_value=make_webhook_response(200))) as mock_post,
+        patch.object(skill, "set_next_alarm_from_cron") as mock_set_next_alarm_from_cron,
+    ):
+        # Trigger alarm
+        await skill.trigger_alarm()
+
+        # Verify the webhook was called and the next alarm gets set
+        mock_post.assert_called_once()
+        mock_set_next_alarm_from_cron.assert_called_once()
+
+
+async def test_trigger_alarm_failure(skill):
+    with (
+        patch.object(skill._http_client, "post", AsyncMock(return_value=make_webhook_response(500))),
+        patch.object(skill, "set_next_alarm_from_cron") as mock_set_next_alarm_from_cron,
+    ):
+        # Trigger alarm
+        await skill.trigger_alarm()
+
+        # Verify that an error log is generated for the failed status
+        skill.logger.error.assert_called_once()
+        assert "Failed to trigger alarm:" in skill.logger.error.call_args[0][0]
+
+        # Verify the retry logic
+        mock_set_next_alarm_from_cron.assert_called_once()
+
+
+async def test_break_execution(skill, engine_async):
+    # Add a mock active alarm to the database
+    mock_alarm = models.ASSActiveAlarm(
+        name="Test Alarm",
+        scheduled_time=datetime.now() + timedelta(hours=1),
+    )
+    async with AsyncSession(engine_async) as session, session.begin():
+        session.add(mock_alarm)
+
+    # Set a mock active timer handle
+    skill._active_alarm_handle = Mock()
+
+    # Execute break_execution
+    await skill.break_execution()
+
+    # Verify that the active timer was cancelled
+    assert skill._active_alarm_handle is None
+
+    # Verify that the alarm was deleted from the database
+    async with AsyncSession(engine_async) as session:
+        result = await session.exec(select(models.ASSActiveAlarm))
+        remaining_alarms = result.all()
+        assert len(remaining_alarms) == 0
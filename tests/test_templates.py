@@ -5,21 +5,26 @@ import pytest
 
 from private_assistant_alarm_scheduler_skill.alarm_scheduler_skill import Parameters
 
+_TEMPLATE_NAMES = ("set.j2", "get_active.j2", "skip.j2", "continue.j2", "break.j2")
 
-# Fixture to set up the Jinja environment
-@pytest.fixture(scope="module")
-def jinja_env():
-    return jinja2.Environment(
+
+# Fixture pre-loading every template once for the whole session; rendering then
+# never goes back through the loader's freshness checks
+@pytest.fixture(scope="session")
+def templates():
+    env = jinja2.Environment(
         loader=jinja2.PackageLoader(
             "private_assistant_alarm_scheduler_skill",
             "templates",
         ),
+        auto_reload=False,
+        cache_size=-1,
     )
+    return {name: env.get_template(name) for name in _TEMPLATE_NAMES}
 
 
-def get_template_output(template_name, parameters, env):
-    template = env.get_template(template_name)
-    return template.render(parameters=parameters)
+def get_template_output(template_name, parameters, templates):
+    return templates[template_name].render(parameters=parameters)
 
 
 @pytest.mark.parametrize(
@@ -31,8 +36,8 @@ def get_template_output(template_name, parameters, env):
         ),
     ],
 )
-def test_alarm_set_template(jinja_env, parameters, expected_output):
-    assert get_template_output("set.j2", parameters, jinja_env) == expected_output
+def test_alarm_set_template(templates, parameters, expected_output):
+    assert get_template_output("set.j2", parameters, templates) == expected_output
 
 
 @pytest.mark.parametrize(
@@ -48,8 +53,8 @@ def test_alarm_set_template(jinja_env, parameters, expected_output):
         ),
     ],
 )
-def test_get_active_template(jinja_env, parameters, expected_output):
-    assert get_template_output("get_active.j2", parameters, jinja_env) == expected_output
+def test_get_active_template(templates, parameters, expected_output):
+    assert get_template_output("get_active.j2", parameters, templates) == expected_output
 
 
 @pytest.mark.parametrize(
@@ -61,8 +66,8 @@ def test_get_active_template(jinja_env, parameters, expected_output):
         ),
     ],
 )
-def test_skip_template(jinja_env, parameters, expected_output):
-    assert get_template_output("skip.j2", parameters, jinja_env) == expected_output
+def test_skip_template(templates, parameters, expected_output):
+    assert get_template_output("skip.j2", parameters, templates) == expected_output
 
 
 # Test for continue.j2 template
@@ -75,8 +80,8 @@ def test_skip_template(jinja_env, parameters, expected_output):
         ),
     ],
 )
-def test_continue_template(jinja_env, parameters, expected_output):
-    assert get_template_output("continue.j2", parameters, jinja_env) == expected_output
+def test_continue_template(templates, parameters, expected_output):
+    assert get_template_output("continue.j2", parameters, templates) == expected_output
 
 
 # Test for break.j2 template
@@ -89,5 +94,5 @@ def test_continue_template(jinja_env, parameters, expected_output):
         ),
     ],
 )
-def test_break_template(jinja_env, parameters, expected_output):
-    assert get_template_output("break.j2", parameters, jinja_env) == expected_output
+def test_break_template(templates, parameters, expected_output):
+    assert get_template_output("break.j2", parameters, templates) == expected_output